@@ -1,13 +1,16 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
-import asyncio
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from functools import lru_cache
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field, field_validator
 
-from server_runner import run_start_server_flow
+from server_runner import CLIENT, LOG_WRITER, run_start_server_flow
 
 EXPOSE_FULL_JWT = os.getenv("STARTSERVER_EXPOSE_FULL_JWT", "false").lower() in {
     "1",
@@ -15,6 +18,17 @@ EXPOSE_FULL_JWT = os.getenv("STARTSERVER_EXPOSE_FULL_JWT", "false").lower() in {
     "yes",
 }
 
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    LOG_WRITER.start()
+    try:
+        yield
+    finally:
+        await LOG_WRITER.stop()
+        await CLIENT.aclose()
+
+
 app = FastAPI(
     title="Start Server Relay",
     version="1.0.0",
@@ -22,6 +36,8 @@ app = FastAPI(
         "Simple unauthenticated API that refreshes the Clerk session via initsend.txt, "
         "injects the new JWT into the serverstart template, and calls StartSession."
     ),
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -59,10 +75,9 @@ class TriggerResponse(BaseModel):
     startserver: CurlPayload
 
 
+@lru_cache(maxsize=128)
 def _mask(token: str) -> str:
-    if len(token) <= 12:
-        return token
-    return f"{token[:6]}...{token[-6:]}"
+    return token[:6] + "..." + token[-6:] if len(token) > 12 else token
 
 
 @app.get("/", tags=["meta"])
@@ -79,9 +94,9 @@ def health() -> dict[str, str]:
 
 
 @app.post("/trigger", response_model=TriggerResponse, tags=["startserver"])
-async def trigger(payload: TriggerRequest) -> TriggerResponse:
+async def trigger(payload: TriggerRequest) -> ORJSONResponse:
     try:
-        result = await asyncio.to_thread(run_start_server_flow)
+        result = await run_start_server_flow()
     except FileNotFoundError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
     except RuntimeError as exc:
@@ -91,12 +106,16 @@ async def trigger(payload: TriggerRequest) -> TriggerResponse:
 
     response_status = "ok" if result.startserver.returncode == 0 else "error"
 
-    return TriggerResponse(
-        status=response_status,
-        call=payload.call,
-        token_preview=_mask(result.token),
-        token=result.token if EXPOSE_FULL_JWT else None,
-        log_path=str(result.log_path),
-        initsend=CurlPayload(**result.initsend.to_payload()),
-        startserver=CurlPayload(**result.startserver.to_payload()),
+    # The payload is already in TriggerResponse shape; returning the response
+    # directly skips re-validating and re-serialising it through the model.
+    return ORJSONResponse(
+        {
+            "status": response_status,
+            "call": payload.call,
+            "token_preview": _mask(result.token),
+            "token": result.token if EXPOSE_FULL_JWT else None,
+            "log_path": str(result.log_path),
+            "initsend": result.initsend.to_payload(),
+            "startserver": result.startserver.to_payload(),
+        }
     )
\ No newline at end of file
@@ -2,27 +2,41 @@
 """
 Core logic shared by the FastAPI service and the CLI helper.
 
-It pulls the curl command from initsend.txt, executes it to obtain a fresh
-last_active_token.jwt, injects that JWT into serverstart-orig.txt (without
-writing any backups), executes the resulting curl, and logs the whole exchange.
+It pulls the curl command from initsend.txt, replays it through a shared
+httpx client to obtain a fresh last_active_token.jwt, injects that JWT into
+serverstart-orig.txt (without writing any backups), replays the resulting curl,
+and logs the whole exchange.
 """
 from __future__ import annotations
 
+import asyncio
+import base64
 import json
+import logging
 import os
 import re
 import shlex
-import subprocess
+import time
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
+
+import httpx
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
 
 INITSEND_FILE = Path(os.getenv("INITSEND_FILE", "initsend.txt"))
 START_TEMPLATE_FILE = Path(os.getenv("START_TEMPLATE_FILE", "serverstart-orig.txt"))
 LOG_DIR = Path(os.getenv("STARTSERVER_LOG_DIR", "logs"))
+LOG_BATCH_SIZE = 64
+LOG_FLUSH_INTERVAL = 0.1
+
+logger = logging.getLogger(__name__)
 
-LINE_CONTINUATION_PATTERN = re.compile(r'\\\s*\r?\n')
 AUTH_HEADER_PATTERN = re.compile(
     r"(-H\s+['\"]authorization:\s*Bearer\s*)([^'\"]+)(['\"])",
     flags=re.IGNORECASE,
@@ -31,15 +45,69 @@ AUTH_FALLBACK_PATTERN = re.compile(
     r"(authorization:\s*Bearer\s+)(\S+)",
     flags=re.IGNORECASE,
 )
+JWT_LOOSE_PATTERN = re.compile(r'"jwt"\s*:\s*"([^"]+)"')
+# Characters that end a plain run of text while splitting a curl command.
+SPLIT_STOP_PATTERN = re.compile(r"[ \t\r\n'\"\\]")
+
+LAST_ACTIVE_TOKEN_MARKER = '"last_active_token"'
+JWT_KEY_MARKER = '"jwt"'
+LAST_ACTIVE_TOKEN_MARKER_BYTES = LAST_ACTIVE_TOKEN_MARKER.encode("ascii")
+JWT_KEY_MARKER_BYTES = JWT_KEY_MARKER.encode("ascii")
+RESPONSE_CHUNK_SIZE = 65536
+
+HTTP_TIMEOUT = float(os.getenv("STARTSERVER_HTTP_TIMEOUT", "30"))
+
+CLIENT = httpx.AsyncClient(
+    http2=True,
+    timeout=HTTP_TIMEOUT,
+    limits=httpx.Limits(max_keepalive_connections=32),
+)
+
+# curl options that take a value but have no bearing on the request we send.
+_CURL_IGNORED_VALUE_OPTIONS = {"-o", "--output", "-m", "--max-time", "--connect-timeout"}
+# curl flags that are safe to ignore; httpx already negotiates compression.
+_CURL_IGNORED_FLAGS = {
+    "-s",
+    "--silent",
+    "-S",
+    "--show-error",
+    "-i",
+    "--include",
+    "-v",
+    "--verbose",
+    "--compressed",
+    "--http2",
+    "--http1.1",
+}
+_CURL_DATA_OPTIONS = {"-d", "--data", "--data-raw", "--data-binary", "--data-ascii"}
+
+# Placeholder injected into the serverstart template when it is parsed, so the
+# argv slot holding the bearer token can be located once and reused.
+_JWT_SLOT = "__STARTSERVER_JWT_SLOT__"
+
+# path -> (st_mtime_ns, st_size, parsed template)
+_TEMPLATE_CACHE: dict[Path, tuple[int, int, Any]] = {}
+
+_stamp_second = -1
+_stamp_text = ""
+
+# Required files were last seen present; skip re-checking until this monotonic deadline.
+REQUIRED_FILES_TTL = 5.0
+_files_ok_until = 0.0
 
 
 @dataclass
 class CurlResult:
     command: str
     returncode: int
-    stdout: str
+    body: bytes | bytearray
     stderr: str
     executed_at: str
+    encoding: str = "utf-8"
+
+    @cached_property
+    def stdout(self) -> str:
+        return self.body.decode(self.encoding, errors="replace")
 
     def to_payload(self) -> dict[str, Any]:
         return {
@@ -58,20 +126,122 @@ class FlowResult:
     log_path: Path
 
 
-def run_start_server_flow() -> FlowResult:
+class LogWriter:
+    """Background task that batches run logs and appends them to disk.
+
+    While running, records are queued and written in batches of up to
+    ``batch_size`` or every ``flush_interval`` seconds, off the event loop.
+    When it is not running (e.g. the CLI helper) records are written inline.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = LOG_BATCH_SIZE,
+        flush_interval: float = LOG_FLUSH_INTERVAL,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: Optional[asyncio.Queue[Optional[tuple[Path, list[bytes]]]]] = None
+        self._task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None or self._queue is None:
+            return
+        if not self._task.done():
+            self._queue.put_nowait(None)
+        await self._task
+        self._task = None
+        self._queue = None
+
+    def submit(self, path: Path, chunks: list[bytes]) -> None:
+        if self.running and self._queue is not None:
+            self._queue.put_nowait((path, chunks))
+        else:
+            _write_log_records([(path, chunks)])
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            record = await queue.get()
+            if record is None:
+                break
+            batch = [record]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    record = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if record is None:
+                    stopping = True
+                    break
+                batch.append(record)
+            await asyncio.to_thread(_write_log_records, batch)
+
+
+LOG_WRITER = LogWriter()
+
+
+class JwtStreamScanner:
+    """Looks for last_active_token.jwt in a response body as it streams in.
+
+    ``scan`` is called with the growing body after every chunk and only
+    re-examines bytes it has not ruled out yet, so the token is found without
+    decoding the body or parsing it as JSON.
+    """
+
+    def __init__(self) -> None:
+        self.token: Optional[str] = None
+        self._search_from = 0
+        self._value_from: Optional[int] = None
+
+    def scan(self, body: bytearray) -> Optional[str]:
+        if self.token is not None:
+            return self.token
+        if self._value_from is None:
+            idx = body.find(LAST_ACTIVE_TOKEN_MARKER_BYTES, self._search_from)
+            if idx == -1:
+                self._search_from = max(0, len(body) - len(LAST_ACTIVE_TOKEN_MARKER_BYTES) + 1)
+                return None
+            self._value_from = idx + len(LAST_ACTIVE_TOKEN_MARKER_BYTES)
+        self.token = _scan_for_jwt(body, self._value_from)
+        return self.token
+
+
+async def run_start_server_flow() -> FlowResult:
+    started_at = time.time()
     _ensure_required_files()
 
-    initsend_cmd = _command_from_file(INITSEND_FILE)
-    initsend_result = _execute_curl(initsend_cmd)
+    initsend_request = await _cached_template(INITSEND_FILE, _parse_initsend_template)
+    scanner = JwtStreamScanner()
+    initsend_result = await _execute_request(
+        *initsend_request, scanner=scanner, started_at=started_at
+    )
 
-    token = _extract_jwt_from_text(initsend_result.stdout)
+    token = scanner.token or _extract_jwt_from_text(initsend_result.stdout)
     if not token:
         raise RuntimeError("Unable to locate last_active_token.jwt in initsend response.")
 
-    startserver_cmd = _build_startserver_command(token)
-    startserver_result = _execute_curl(startserver_cmd)
+    startserver_args = await _build_startserver_command(token)
+    startserver_result = await _execute_request(*curl_to_httpx(startserver_args))
 
-    log_path = _log_flow(token, initsend_result, startserver_result)
+    log_path = _log_flow(token, initsend_result, startserver_result, started_at)
 
     return FlowResult(
         token=token,
@@ -82,14 +252,60 @@ def run_start_server_flow() -> FlowResult:
 
 
 def _ensure_required_files() -> None:
+    global _files_ok_until
+
+    if time.monotonic() < _files_ok_until:
+        return
     missing = [str(p) for p in (INITSEND_FILE, START_TEMPLATE_FILE) if not p.is_file()]
     if missing:
+        _files_ok_until = 0.0
         raise FileNotFoundError(f"Missing required file(s): {', '.join(missing)}")
+    _files_ok_until = time.monotonic() + REQUIRED_FILES_TTL
+
 
+async def _cached_template(path: Path, parse: Callable[[str], Any]) -> Any:
+    stat = path.stat()
+    cached = _TEMPLATE_CACHE.get(path)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
 
-def _command_from_file(path: Path) -> str:
-    raw = path.read_text(encoding="utf-8")
-    return _normalize_curl_text(raw)
+    # Only a cache miss touches file contents; keep that read off the event loop.
+    raw = await asyncio.to_thread(_read_all_bytes, path)
+    parsed = parse(raw.decode("utf-8"))
+    _TEMPLATE_CACHE[path] = (stat.st_mtime_ns, stat.st_size, parsed)
+    return parsed
+
+
+def _read_all_bytes(path: Path) -> bytes:
+    """Read ``path`` with raw ``os.read`` calls, sized from ``fstat``."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size)
+        # Regular files hand back everything in one read; only loop on a short read.
+        while len(data) < size:
+            more = os.read(fd, size - len(data))
+            if not more:
+                break
+            data += more
+        return data
+    finally:
+        os.close(fd)
+
+
+def _parse_initsend_template(
+    raw: str,
+) -> tuple[str, str, list[tuple[str, str]], Optional[bytes]]:
+    return curl_to_httpx(_split_curl_command(_normalize_curl_text(raw)))
+
+
+def _parse_startserver_template(raw: str) -> tuple[list[str], int, str, str]:
+    args = _split_curl_command(_normalize_curl_text(_inject_jwt(raw, _JWT_SLOT)))
+    for index, arg in enumerate(args):
+        prefix, found, suffix = arg.partition(_JWT_SLOT)
+        if found:
+            return args, index, prefix, suffix
+    raise RuntimeError("Authorization header not found inside serverstart template.")
 
 
 def _normalize_curl_text(raw: str) -> str:
@@ -97,15 +313,20 @@ def _normalize_curl_text(raw: str) -> str:
     if idx == -1:
         raise RuntimeError("Unable to find 'curl' in the provided text.")
     stripped = raw[idx:]
-    single_line = LINE_CONTINUATION_PATTERN.sub(" ", stripped)
+    single_line = stripped.replace("\\\r\n", " ").replace("\\\n", " ")
     return single_line.strip()
 
 
 def _split_curl_command(command: str) -> list[str]:
     try:
-        args = shlex.split(command, posix=True)
-    except ValueError as exc:
-        raise RuntimeError(f"Unable to parse curl command: {exc}") from exc
+        args = _fast_curl_split(command)
+    except ValueError:
+        # Let shlex decide on anything the fast path does not recognise, so
+        # errors keep shlex's wording.
+        try:
+            args = shlex.split(command, posix=True)
+        except ValueError as exc:
+            raise RuntimeError(f"Unable to parse curl command: {exc}") from exc
 
     if not args:
         raise RuntimeError("The curl command is empty.")
@@ -120,49 +341,247 @@ def _split_curl_command(command: str) -> list[str]:
     return args
 
 
-def _execute_curl(command: str) -> CurlResult:
-    args = _split_curl_command(command)
-    timestamp = _utc_now()
+def curl_to_httpx(
+    args: list[str],
+) -> tuple[str, str, list[tuple[str, str]], Optional[bytes]]:
+    """Translate a curl argv into ``(method, url, headers, data)`` for httpx."""
+    method: Optional[str] = None
+    url: Optional[str] = None
+    headers: list[tuple[str, str]] = []
+    data_parts: list[str] = []
+
+    it = iter(args[1:])
+    for arg in it:
+        if not arg.startswith("-"):
+            url = arg
+            continue
+        if arg in _CURL_IGNORED_FLAGS:
+            continue
+
+        try:
+            value = next(it)
+        except StopIteration as exc:
+            raise RuntimeError(f"curl option {arg} is missing its value.") from exc
+
+        if arg in ("-X", "--request"):
+            method = value.upper()
+        elif arg in ("-H", "--header"):
+            name, sep, header_value = value.partition(":")
+            if not sep:
+                raise RuntimeError(f"Malformed curl header: {value!r}")
+            headers.append((name.strip(), header_value.strip()))
+        elif arg in _CURL_DATA_OPTIONS:
+            if arg != "--data-raw" and value.startswith("@"):
+                raise RuntimeError(f"curl {arg} @file payloads are not supported.")
+            data_parts.append(value)
+        elif arg in ("-b", "--cookie"):
+            headers.append(("cookie", value))
+        elif arg in ("-u", "--user"):
+            credentials = base64.b64encode(value.encode("utf-8")).decode("ascii")
+            headers.append(("authorization", f"Basic {credentials}"))
+        elif arg in ("-A", "--user-agent"):
+            headers.append(("user-agent", value))
+        elif arg in ("-e", "--referer"):
+            headers.append(("referer", value))
+        elif arg == "--url":
+            url = value
+        elif arg in _CURL_IGNORED_VALUE_OPTIONS:
+            continue
+        else:
+            raise RuntimeError(f"Unsupported curl option: {arg}")
+
+    if url is None:
+        raise RuntimeError("curl command does not contain a URL.")
+
+    data = "&".join(data_parts).encode("utf-8") if data_parts else None
+    if data is not None and not any(name.lower() == "content-type" for name, _ in headers):
+        headers.append(("content-type", "application/x-www-form-urlencoded"))
+    if method is None:
+        method = "POST" if data is not None else "GET"
+
+    return method, url, headers, data
+
+
+def _fast_curl_split(command: str) -> list[str]:
+    """Split a curl command the way ``shlex.split(posix=True)`` does.
+
+    Covers what browser "copy as cURL" exports use: whitespace separators,
+    single quotes, double quotes, and backslash escapes. Raises ``ValueError``
+    on anything it cannot finish so the caller can fall back to shlex.
+    """
+    args: list[str] = []
+    length = len(command)
+    i = 0
+    while i < length:
+        while i < length and command[i] in " \t\r\n":
+            i += 1
+        if i >= length:
+            break
+
+        parts: list[str] = []
+        while i < length and command[i] not in " \t\r\n":
+            char = command[i]
+            if char == "'":
+                end = command.find("'", i + 1)
+                if end == -1:
+                    raise ValueError("No closing quotation")
+                parts.append(command[i + 1 : end])
+                i = end + 1
+            elif char == '"':
+                i = _consume_double_quoted(command, i + 1, parts)
+            elif char == "\\":
+                if i + 1 >= length:
+                    raise ValueError("No escaped character")
+                parts.append(command[i + 1])
+                i += 2
+            else:
+                stop = SPLIT_STOP_PATTERN.search(command, i)
+                end = stop.start() if stop else length
+                parts.append(command[i:end])
+                i = end
+        args.append("".join(parts))
+    return args
+
+
+def _consume_double_quoted(command: str, start: int, parts: list[str]) -> int:
+    i = start
+    while True:
+        quote = command.find('"', i)
+        if quote == -1:
+            raise ValueError("No closing quotation")
+        backslash = command.find("\\", i, quote)
+        if backslash == -1:
+            parts.append(command[i:quote])
+            return quote + 1
+
+        parts.append(command[i:backslash])
+        escaped = command[backslash + 1 : backslash + 2]
+        if escaped in ('"', "\\"):
+            parts.append(escaped)
+            i = backslash + 2
+        else:
+            parts.append("\\")
+            i = backslash + 1
+
+
+async def _execute_request(
+    method: str,
+    url: str,
+    headers: list[tuple[str, str]],
+    data: Optional[bytes],
+    *,
+    scanner: Optional[JwtStreamScanner] = None,
+    started_at: Optional[float] = None,
+) -> CurlResult:
+    timestamp = _utc_isoformat(time.time() if started_at is None else started_at)
+    request = CLIENT.build_request(method, url, headers=headers, content=data)
+    body = bytearray()
     try:
-        proc = subprocess.run(args, capture_output=True, text=True, check=False)
-    except FileNotFoundError as exc:
-        raise RuntimeError("curl executable is not available on PATH.") from exc
+        response = await CLIENT.send(request, stream=True)
+        try:
+            async for chunk in response.aiter_bytes(RESPONSE_CHUNK_SIZE):
+                body += chunk
+                if scanner is not None:
+                    scanner.scan(body)
+        finally:
+            await response.aclose()
+    except httpx.HTTPError as exc:
+        return CurlResult(
+            command=f"{method} {url}",
+            returncode=1,
+            body=b"",
+            stderr=f"{type(exc).__name__}: {exc}",
+            executed_at=timestamp,
+        )
 
     return CurlResult(
-        command=" ".join(args),
-        returncode=proc.returncode,
-        stdout=proc.stdout,
-        stderr=proc.stderr,
+        command=f"{method} {url}",
+        returncode=0,
+        body=body,
+        stderr="",
         executed_at=timestamp,
+        encoding=response.encoding or "utf-8",
     )
 
 
 def _extract_jwt_from_text(text: str) -> Optional[str]:
-    try:
-        data = json.loads(text)
-    except json.JSONDecodeError:
-        data = None
-
-    if data is not None:
-        token = _dig_for_key(data, "last_active_token")
-        if isinstance(token, dict) and "jwt" in token:
-            return token["jwt"]
-
-    match = re.search(
-        r'"last_active_token"\s*:\s*\{[^}]*"jwt"\s*:\s*"([^"]+)"',
-        text,
-        flags=re.DOTALL | re.IGNORECASE,
-    )
-    if match:
-        return match.group(1)
-
-    match = re.search(r'"jwt"\s*:\s*"([^"]+)"', text)
+    start = text.find(LAST_ACTIVE_TOKEN_MARKER)
+    if start != -1:
+        token = _scan_for_jwt(text, start + len(LAST_ACTIVE_TOKEN_MARKER))
+        if token:
+            return token
+
+        # The marker is there but the fast scan could not slice the value out
+        # (unusual key order or nesting); let the JSON walk sort it out.
+        try:
+            data = _json_loads(text)
+        except ValueError:
+            data = None
+        if data is not None:
+            token_obj = _dig_for_key(data, "last_active_token")
+            if isinstance(token_obj, dict) and isinstance(token_obj.get("jwt"), str):
+                return token_obj["jwt"]
+
+    match = JWT_LOOSE_PATTERN.search(text)
     if match:
         return match.group(1)
 
     return None
 
 
+def _scan_for_jwt(text: str | bytes | bytearray, start: int) -> Optional[str]:
+    """Slice the ``"jwt"`` string value out of the object that begins at ``start``.
+
+    Works on both decoded text and raw response bytes.
+    """
+    if isinstance(text, str):
+        key_marker, brace, colon_char, quote = JWT_KEY_MARKER, "}", ":", '"'
+    else:
+        key_marker, brace, colon_char, quote = JWT_KEY_MARKER_BYTES, b"}", b":", b'"'
+
+    key = text.find(key_marker, start)
+    if key == -1 or text.find(brace, start, key) != -1:
+        return None
+
+    value_start = key + len(key_marker)
+    colon = text.find(colon_char, value_start)
+    if colon == -1 or text[value_start:colon].strip():
+        return None
+
+    open_quote = text.find(quote, colon + 1)
+    if open_quote == -1 or text[colon + 1 : open_quote].strip():
+        return None
+
+    close_quote = text.find(quote, open_quote + 1)
+    if close_quote == -1:
+        return None
+    value = text[open_quote + 1 : close_quote]
+    if not value:
+        return None
+    return value if isinstance(value, str) else value.decode("utf-8", errors="replace")
+
+
+def _jwt_segments(token: str) -> tuple[int, int, int, int]:
+    """Locate the JWT segments without splitting the token.
+
+    Returns ``(0, dot1, dot1 + 1, dot2)`` so callers can slice the header as
+    ``token[0:dot1]``, the payload as ``token[dot1 + 1:dot2]`` and the
+    signature as ``token[dot2 + 1:]``. The flow only forwards the token, so
+    nothing decodes it today; this is here for any validation added later.
+    """
+    dot1 = token.find(".")
+    dot2 = token.find(".", dot1 + 1) if dot1 != -1 else -1
+    if dot2 == -1 or token.find(".", dot2 + 1) != -1:
+        raise ValueError("JWT must have exactly three dot-separated segments.")
+    return 0, dot1, dot1 + 1, dot2
+
+
+def _json_loads(text: str) -> Any:
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
 def _dig_for_key(obj: Any, key: str) -> Any:
     if isinstance(obj, dict):
         if key in obj:
@@ -179,60 +598,86 @@ def _dig_for_key(obj: Any, key: str) -> Any:
     return None
 
 
-def _build_startserver_command(jwt: str) -> str:
-    template_text = START_TEMPLATE_FILE.read_text(encoding="utf-8")
-    updated_text = _inject_jwt(template_text, jwt)
-    return _normalize_curl_text(updated_text)
+async def _build_startserver_command(jwt: str) -> list[str]:
+    template_args, auth_index, prefix, suffix = await _cached_template(
+        START_TEMPLATE_FILE, _parse_startserver_template
+    )
+    args = list(template_args)
+    args[auth_index] = prefix + jwt + suffix
+    return args
 
 
 def _inject_jwt(text: str, jwt: str) -> str:
-    if AUTH_HEADER_PATTERN.search(text):
-        return AUTH_HEADER_PATTERN.sub(
-            lambda m: f"{m.group(1)}{jwt}{m.group(3)}",
-            text,
-            count=1,
-        )
-    if AUTH_FALLBACK_PATTERN.search(text):
-        return AUTH_FALLBACK_PATTERN.sub(
-            r"\1" + jwt,
-            text,
-            count=1,
-        )
-    raise RuntimeError("Authorization header not found inside serverstart template.")
-
-
-def _log_flow(token: str, init_res: CurlResult, start_res: CurlResult) -> Path:
-    LOG_DIR.mkdir(parents=True, exist_ok=True)
-    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    match = AUTH_HEADER_PATTERN.search(text) or AUTH_FALLBACK_PATTERN.search(text)
+    if match is None:
+        raise RuntimeError("Authorization header not found inside serverstart template.")
+    return f"{text[:match.start(2)]}{jwt}{text[match.end(2):]}"
+
+
+def _log_flow(
+    token: str,
+    init_res: CurlResult,
+    start_res: CurlResult,
+    started_at: float,
+) -> Path:
+    timestamp = _log_stamp(started_at)
     log_path = LOG_DIR / f"startserver-{timestamp}.log"
-    log_path.write_text(
-        "\n".join(
-            [
-                f"[{timestamp}] startserver run",
-                f"TOKEN: {token}",
-                "",
-                "== initsend ==",
-                f"command: {init_res.command}",
-                f"returncode: {init_res.returncode}",
-                "stdout:",
-                init_res.stdout,
-                "stderr:",
-                init_res.stderr,
-                "",
-                "== startserver ==",
-                f"command: {start_res.command}",
-                f"returncode: {start_res.returncode}",
-                "stdout:",
-                start_res.stdout,
-                "stderr:",
-                start_res.stderr,
-                "",
-            ]
-        ),
-        encoding="utf-8",
-    )
+    # Response bodies go to disk as received; only the short framing around
+    # them is formatted and encoded here.
+    chunks = [
+        (
+            f"[{timestamp}] startserver run\n"
+            f"TOKEN: {token}\n"
+            "\n"
+            "== initsend ==\n"
+            f"command: {init_res.command}\n"
+            f"returncode: {init_res.returncode}\n"
+            "stdout:\n"
+        ).encode("utf-8"),
+        init_res.body,
+        (
+            "\nstderr:\n"
+            f"{init_res.stderr}\n"
+            "\n"
+            "== startserver ==\n"
+            f"command: {start_res.command}\n"
+            f"returncode: {start_res.returncode}\n"
+            "stdout:\n"
+        ).encode("utf-8"),
+        start_res.body,
+        f"\nstderr:\n{start_res.stderr}\n".encode("utf-8"),
+    ]
+    LOG_WRITER.submit(log_path, chunks)
     return log_path
 
 
-def _utc_now() -> str:
-    return datetime.now(timezone.utc).isoformat()
\ No newline at end of file
+def _write_log_records(records: list[tuple[Path, list[bytes]]]) -> None:
+    by_path: dict[Path, list[bytes]] = {}
+    for path, chunks in records:
+        by_path.setdefault(path, []).extend(chunks)
+
+    for path, chunks in by_path.items():
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "ab", buffering=1 << 20) as handle:
+                handle.writelines(chunks)
+        except OSError:
+            logger.exception("Failed to write startserver log %s", path)
+
+
+def _log_stamp(at: float) -> str:
+    """Second-resolution UTC stamp, formatted at most once per second."""
+    global _stamp_second, _stamp_text
+
+    second = int(at)
+    if second != _stamp_second:
+        _stamp_text = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime(second))
+        _stamp_second = second
+    return _stamp_text
+
+
+def _utc_isoformat(at: float) -> str:
+    """Format an epoch timestamp like ``datetime.isoformat`` for an aware UTC value."""
+    second = int(at)
+    micros = int((at - second) * 1_000_000)
+    return f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(second))}.{micros:06d}+00:00"
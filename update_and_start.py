@@ -5,20 +5,19 @@ Useful for debugging locally or triggering the flow without hitting HTTP.
 """
 from __future__ import annotations
 
+import asyncio
 import sys
 
 from server_runner import run_start_server_flow
 
 
 def _mask(token: str) -> str:
-    if len(token) <= 12:
-        return token
-    return f"{token[:6]}...{token[-6:]}"
+    return token[:6] + "..." + token[-6:] if len(token) > 12 else token
 
 
 def main() -> None:
     try:
-        result = run_start_server_flow()
+        result = asyncio.run(run_start_server_flow())
     except Exception as exc:  # noqa: BLE001
         print(f"[ERROR] {exc}", file=sys.stderr)
         sys.exit(1)